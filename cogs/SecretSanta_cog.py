@@ -2,14 +2,12 @@
 
 import disnake
 from disnake.ext import commands
-import logging
 import random
 from rdoclient import RandomOrgClient
 import asyncio
 import json
 from datetime import datetime
 import os
-import openai  # For ChatGPT API usage
 import aiohttp  # For async HTTP requests
 
 async def is_moderator(interaction):
@@ -34,7 +32,6 @@ class SecretSantaCog(commands.Cog):
         self.moderator_channel_id = int(self.config["discord"]["moderator_channel_id"])
         self.announcement_message_id = int(self.config["discord"]["announcement_message_id"])
         self.openai_api_key = self.config.get("openai_api_key")
-        openai.api_key = self.openai_api_key
         self.bot.loop.create_task(self.load_assignments())
 
     def save_assignments(self):
@@ -232,11 +229,7 @@ class SecretSantaCog(commands.Cog):
         )
 
         if self.event_type == "Regular":
-            reveal_text = "🎁 **Secret Santa Assignments:**\n"
-            for santa_id, receiver_id in self.assignments.items():
-                santa_name = await self.get_user_display_name(santa_id)
-                receiver_name = await self.get_user_display_name(receiver_id)
-                reveal_text += f"{santa_name} ➡️ {receiver_name}\n"
+            reveal_text = await self.build_reveal_text()
 
             embed = disnake.Embed(
                 title="🎁 Secret Santa Assignments Revealed! 🎁",
@@ -331,7 +324,7 @@ class SecretSantaCog(commands.Cog):
                 return
 
             try:
-                self.assign_santas()
+                await self.assign_santas()
                 self.logger.info("Secret Santa assignments have been made.")
             except Exception as e:
                 self.logger.error(
@@ -382,18 +375,22 @@ class SecretSantaCog(commands.Cog):
         self.save_assignments()
         self.logger.info("State saved successfully.")
 
-    def assign_santas(self):
+    async def assign_santas(self):
         santa_ids = list(self.participants.keys())
         # Multiple shuffles for higher entropy
         for _ in range(10):
-            santa_ids = self.create_shuffled_list(santa_ids)
+            santa_ids = await self.create_shuffled_list(santa_ids)
 
-        santa_ids.append(santa_ids[0])
-        new_assignments = {}
-        for i in range(0, len(santa_ids) - 1):
-            new_assignments[santa_ids[i]] = santa_ids[i + 1]
+        # Pair each santa with the next one in the shuffled order, wrapping around
+        self.assignments = dict(zip(santa_ids, santa_ids[1:] + santa_ids[:1]))
 
-        self.assignments = new_assignments
+    async def build_reveal_text(self):
+        lines = ["🎁 **Secret Santa Assignments:**"]
+        for santa_id, receiver_id in self.assignments.items():
+            santa_name = await self.get_user_display_name(santa_id)
+            receiver_name = await self.get_user_display_name(receiver_id)
+            lines.append(f"{santa_name} ➡️ {receiver_name}")
+        return "\n".join(lines)
 
     async def fetch_user(self, user_id):
         user = self.bot.get_user(user_id)
@@ -411,14 +408,21 @@ class SecretSantaCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: disnake.RawReactionActionEvent):
-        self.logger.debug(f"on_raw_reaction_add called with payload: {payload}")
+        # Fires for every reaction the bot can see; let logging skip formatting unless DEBUG is on
+        self.logger.debug("on_raw_reaction_add called with payload: %s", payload)
 
         if not self.active or self.join_closed:
-            self.logger.debug(f"Event inactive or joining closed. Active: {self.active}, Join Closed: {self.join_closed}")
+            self.logger.debug(
+                "Event inactive or joining closed. Active: %s, Join Closed: %s",
+                self.active, self.join_closed
+            )
             return
 
         if payload.message_id != self.announcement_message_id:
-            self.logger.debug(f"Reaction not on announcement message. Payload message ID: {payload.message_id}, Announcement message ID: {self.announcement_message_id}")
+            self.logger.debug(
+                "Reaction not on announcement message. Payload message ID: %s, Announcement message ID: %s",
+                payload.message_id, self.announcement_message_id
+            )
             return
 
         guild = self.bot.get_guild(payload.guild_id)
@@ -493,11 +497,7 @@ class SecretSantaCog(commands.Cog):
             )
             return
 
-        reveal_text = "🎁 **Secret Santa Assignments:**\n"
-        for santa_id, receiver_id in self.assignments.items():
-            santa_name = await self.get_user_display_name(santa_id)
-            receiver_name = await self.get_user_display_name(receiver_id)
-            reveal_text += f"{santa_name} ➡️ {receiver_name}\n"
+        reveal_text = await self.build_reveal_text()
 
         embed = disnake.Embed(
             title="🎁 Secret Santa Assignments Revealed! 🎁",
@@ -658,11 +658,7 @@ class SecretSantaCog(commands.Cog):
 
         try:
             question_id = str(datetime.utcnow().timestamp()).replace('.', '')
-
-            if str(giftee_id) not in self.pending_questions:
-                self.pending_questions[str(giftee_id)] = []
-
-            self.pending_questions[str(giftee_id)].append({
+            self.pending_questions.setdefault(str(giftee_id), []).append({
                 "question_id": question_id,
                 "santa_id": santa_id,
                 "question": question,
@@ -690,9 +686,9 @@ class SecretSantaCog(commands.Cog):
         if not isinstance(message.channel, disnake.DMChannel):
             return
 
-        giftee_id = message.author.id
+        giftee_key = str(message.author.id)
 
-        pending = self.pending_questions.get(str(giftee_id))
+        pending = self.pending_questions.get(giftee_key)
         if not pending:
             return
 
@@ -711,9 +707,7 @@ class SecretSantaCog(commands.Cog):
 
             pending.pop()
             if not pending:
-                del self.pending_questions[str(giftee_id)]
-            else:
-                self.pending_questions[str(giftee_id)] = pending
+                del self.pending_questions[giftee_key]
 
             self.save_assignments()
 
@@ -730,11 +724,15 @@ class SecretSantaCog(commands.Cog):
     def cog_unload(self):
         self.logger.info("SecretSantaCog has been unloaded.")
 
-    def generate_integers(self, n, min, max, optional_data=None):
+    def fetch_signed_integers(self, n, min, max, optional_data=None):
+        # Only the blocking Random.org calls; runs in a worker thread, so no logging or state changes here
+        response = self.random_client.generate_signed_integers(n, min, max, replacement=False, user_data=optional_data)
+        link = self.random_client.create_url(response["random"], response["signature"])
+        return response["random"]["data"], link
+
+    async def generate_integers(self, n, min, max, optional_data=None):
         try:
-            response = self.random_client.generate_signed_integers(n, min, max, replacement=False, user_data=optional_data)
-            integers = response["random"]["data"]
-            link = self.random_client.create_url(response["random"], response["signature"])
+            integers, link = await asyncio.to_thread(self.fetch_signed_integers, n, min, max, optional_data)
             self.signed_random_links.append(link)
             self.logger.info(f'Random.org used. Link: {link}')
             return integers
@@ -742,9 +740,9 @@ class SecretSantaCog(commands.Cog):
             self.logger.info(f"Random.org API failed, using Python random instead.\n{e}")
             return random.sample(range(min, max + 1), k=n)
 
-    def create_shuffled_list(self, x):
+    async def create_shuffled_list(self, x):
         x_len = len(x)
-        new_order = self.generate_integers(x_len, 0, x_len - 1, optional_data=x)
+        new_order = await self.generate_integers(x_len, 0, x_len - 1, optional_data=x)
 
         shuffled_x = [None] * x_len
         for i in range(x_len):
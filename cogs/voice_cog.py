@@ -3,64 +3,78 @@ import openai
 import disnake
 from disnake.ext import commands
 import asyncio
-import os
-import aiohttp
+import io
 
 with open('config.json') as config_file:
     config = json.load(config_file)
 
-openai.api_key = config['openai']['api_key']
+# Skip FFmpeg's stream analysis and input buffering so playback starts sooner
+FFMPEG_BEFORE_OPTIONS = "-analyzeduration 0 -fflags nobuffer -flags low_delay"
+FFMPEG_OPTIONS = "-vn -loglevel error"
 
 class VoiceCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.config = config
+        self.openai_client = openai.AsyncOpenAI(api_key=config['openai']['api_key'])
+        # Resolve settings once instead of walking the config on every command
+        self.engine = config['openai'].get('engine', "text-davinci-003")
+        self.max_tokens = config['openai'].get('max_tokens', 1000)
+        self.temperature = config['openai'].get('temperature', 0.5)
+        self.tts_model = config['openai'].get('tts_model', 'tts-1')
+        self.default_voice = config['voice']['default_voice']
 
     async def process_with_openai(self, text):
-        response = openai.Completion.create(
-            engine=self.config['openai']['engine'] if 'engine' in self.config['openai'] else "text-davinci-003",
+        response = await self.openai_client.completions.create(
+            model=self.engine,
             prompt=text,
-            max_tokens=self.config['openai'].get('max_tokens', 1000),
+            max_tokens=self.max_tokens,
             n=1,
             stop=None,
-            temperature=self.config['openai'].get('temperature', 0.5)
+            temperature=self.temperature
         )
         processed_text = response.choices[0].text.strip()
         return processed_text
 
     async def generate_speech(self, text, voice):
-        response = openai.TextToSpeech.create(
-            text=text,
-            voice=voice
+        response = await self.openai_client.audio.speech.create(
+            model=self.tts_model,
+            input=text,
+            voice=voice,
+            response_format="opus"
         )
-        audio_url = response['audio_url']
-        return audio_url
+        return response.content
 
     @commands.command(name='speak', help='Make the bot speak generated text')
     async def speak(self, ctx, *, message):
         processed_message = await self.process_with_openai(message)
-        voice_code = self.config['voice']['default_voice']
-        audio_url = await self.generate_speech(processed_message, voice_code)
+        audio_data = await self.generate_speech(processed_message, self.default_voice)
         if ctx.author.voice:
             voice_channel = ctx.author.voice.channel
-            if voice_channel not in self.bot.voice_clients:
-                voice_client = await voice_channel.connect()
-            else:
-                voice_client = disnake.utils.get(self.bot.voice_clients, guild=ctx.guild)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(audio_url) as resp:
-                    if resp.status == 200:
-                        audio_data = await resp.read()
-                        with open('temp_audio.mp3', 'wb') as f:
-                            f.write(audio_data)
-                        audio_source = disnake.FFmpegPCMAudio('temp_audio.mp3')
-                        voice_client.play(audio_source)
-                        while voice_client.is_playing():
-                            await asyncio.sleep(1)
-                        await voice_client.disconnect()
-                        os.remove('temp_audio.mp3')  # Corrected file name for removal
+            voice_client = ctx.guild.voice_client or await voice_channel.connect()
+            if voice_client.channel != voice_channel:
+                await voice_client.move_to(voice_channel)
+            # Feed the audio to FFmpeg over stdin; concurrent speaks no longer share a temp file.
+            # codec="opus" passes the Opus packets through instead of re-encoding them.
+            audio_source = disnake.FFmpegOpusAudio(
+                io.BytesIO(audio_data),
+                pipe=True,
+                codec="opus",
+                before_options=FFMPEG_BEFORE_OPTIONS,
+                options=FFMPEG_OPTIONS
+            )
+            done = asyncio.Event()
+            voice_client.play(
+                audio_source,
+                after=lambda e: self.bot.loop.call_soon_threadsafe(done.set)
+            )
+            await done.wait()
+            await voice_client.disconnect()
         else:
             await ctx.send("You are not in a voice channel.")
 
+    def cog_unload(self):
+        asyncio.create_task(self.openai_client.close())
+
 def setup(bot):
     bot.add_cog(VoiceCog(bot))
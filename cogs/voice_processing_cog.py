@@ -1,11 +1,85 @@
 # cogs/voice_processing_cog.py
 
 import asyncio
-import os
+import hashlib
+import io
 import random
+import re
+from collections import OrderedDict
 import aiohttp
 import disnake
 from disnake.ext import commands
+from disnake.oggparse import OggError, OggStream
+
+# Splits text after sentence-ending punctuation
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+# Longest text sent in a single TTS request
+MAX_CHUNK_CHARS = 500
+# Skip FFmpeg's stream analysis and input buffering so short clips start playing sooner
+FFMPEG_BEFORE_OPTIONS = "-analyzeduration 0 -fflags nobuffer -flags low_delay"
+FFMPEG_OPTIONS = "-vn -loglevel error"
+# Ogg Opus header packets, which carry no audio
+OPUS_HEADER_PACKETS = (b'OpusHead', b'OpusTags')
+# Frame length in ms for each Opus TOC config number (RFC 6716, section 3.1)
+OPUS_FRAME_MS = (
+    [10, 20, 40, 60] * 3  # SILK-only, configs 0-11
+    + [10, 20] * 2  # Hybrid, configs 12-15
+    + [2.5, 5, 10, 20] * 4  # CELT-only, configs 16-31
+)
+
+class OggOpusAudio(disnake.AudioSource):
+    """
+    Plays an in-memory Ogg Opus clip by passing its packets straight to Discord, without FFmpeg.
+    The voice client sends one packet every 20 ms, so only clips with 20 ms packets can be played
+    this way; check with has_20ms_packets first.
+    """
+
+    def __init__(self, data: bytes):
+        self.packets = OggStream(io.BytesIO(data)).iter_packets()
+
+    def read(self) -> bytes:
+        for packet in self.packets:
+            # Skip the stream headers; only audio packets are sent
+            if not packet.startswith(OPUS_HEADER_PACKETS):
+                return packet
+        return b''
+
+    @staticmethod
+    def packet_duration_ms(packet: bytes) -> float:
+        """
+        Returns the audio length of an Opus packet from its TOC byte.
+
+        Args:
+            packet (bytes): The Opus packet.
+        """
+        toc = packet[0]
+        frame_code = toc & 0x03
+        if frame_code == 0:
+            frame_count = 1
+        elif frame_code in (1, 2):
+            frame_count = 2
+        else:
+            frame_count = packet[1] & 0x3F if len(packet) > 1 else 0
+        return OPUS_FRAME_MS[toc >> 3] * frame_count
+
+    @classmethod
+    def has_20ms_packets(cls, data: bytes) -> bool:
+        """
+        Checks that a clip's audio packets are 20 ms long, judging by its first audio packet.
+
+        Args:
+            data (bytes): The Ogg Opus clip.
+        """
+        try:
+            for packet in OggStream(io.BytesIO(data)).iter_packets():
+                if packet and not packet.startswith(OPUS_HEADER_PACKETS):
+                    return cls.packet_duration_ms(packet) == 20
+        except OggError:
+            pass
+        return False
+
+    def is_opus(self) -> bool:
+        return True
 
 class VoiceProcessingCog(commands.Cog):
     """
@@ -23,24 +97,42 @@ class VoiceProcessingCog(commands.Cog):
         self.default_voice = self.config['tts']['default_voice']
         self.available_voices = self.config['tts']['voices']['available_voices']
         self.delay_between_messages = self.config['tts']['delay_between_messages']
+        # Request fields that are the same for every message; voice and input are added per call
+        self.base_payload = {
+            "temperature": self.config['tts'].get('temperature', 0.5),
+            "max_tokens": self.config['tts'].get('max_tokens', 100),
+            "model": self.config['tts'].get('engine', 'standard')
+        }
+        # Opt-in: set to "opus" for providers that support it so clips play without FFmpeg
+        self.response_format = self.config['tts'].get('response_format')
+        if self.response_format:
+            self.base_payload["response_format"] = self.response_format
 
         # Custom voice mappings for specific users
         self.user_voice_mappings = self.config['tts']['voices'].get('user_voice_mappings', {})
         self.required_role_id = int(self.config['discord']['no_mic_role_id'])  # Or the correct role ID
         self.excluded_role_name = "RUTHRO VOICE"
-
-        # Fixed audio file path in the project directory
-        self.audio_file = "temp_audio_file.mp3"
-        self.audio_path = os.path.join(os.getcwd(), self.audio_file)
-        self.logger.debug(f"Fixed TTS audio file path set to: {self.audio_path}")
+        self.excluded_role_ids = {}  # Guild ID -> ID of the excluded role, resolved by name once
+        self.guild_id = int(self.config['discord']['guild_id'])
+        self.channel_id = int(self.config['discord']['channel_id'])
 
         self.voice_clients = {}  # Dictionary to manage voice clients per guild
-        self.queue = asyncio.Queue()  # Queue for TTS messages
+        # Queue for TTS messages; bounded so a burst of messages cannot build a long backlog
+        self.queue = asyncio.Queue(maxsize=self.config['tts'].get('max_queue_size', 32))
+        # Synthesized audio waiting to be played; bounded so synthesis only runs a few clips ahead
+        self.playback_queue = asyncio.Queue(maxsize=3)
 
         self.user_voices = {}  # Stores assigned voices per user
+        self.audio_cache = OrderedDict()  # Hash of (voice, text) -> audio bytes, least recently used first
+        self.audio_cache_size = self.config['tts'].get('cache_size', 128)
+        self.inflight_audio = {}  # Cache key -> task synthesizing that clip, shared by identical requests
+        self.inflight_waiters = {}  # Synthesis task -> number of callers awaiting it
+        self.synthesis_semaphore = asyncio.Semaphore(3)  # Limits concurrent TTS API requests
+        self.session = None  # Shared aiohttp session, created on first use inside the running loop
 
         # Start the process_queue task
-        self.bot.loop.create_task(self.process_queue())
+        self.process_queue_task = self.bot.loop.create_task(self.process_queue())
+        self.process_playback_task = self.bot.loop.create_task(self.process_playback())
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -50,20 +142,17 @@ class VoiceProcessingCog(commands.Cog):
         Args:
             message (disnake.Message): The incoming message.
         """
-        self.logger.debug(f"on_message triggered: {message.content}")
+        # Most messages are outside the TTS channel, so drop them before anything else
+        if message.channel.id != self.channel_id:
+            return
 
         # Ignore messages from bots
         if message.author.bot:
             self.logger.debug(f"Ignored message from bot: {message.author}")
             return
 
-        # Check if the message is in the specified guild and channel
-        guild_id = int(self.config['discord']['guild_id'])
-        channel_id = int(self.config['discord']['channel_id'])
-        if message.guild.id != guild_id or message.channel.id != channel_id:
-            self.logger.debug(
-                f"Ignored message from guild ID {message.guild.id} or channel ID {message.channel.id}"
-            )
+        if message.guild is None or message.guild.id != self.guild_id:
+            self.logger.debug(f"Ignored message from outside guild ID {self.guild_id}")
             return
 
         self.logger.info(
@@ -81,38 +170,74 @@ class VoiceProcessingCog(commands.Cog):
         Args:
             message (disnake.Message): The message to process.
         """
-        await self.queue.put(message)
+        if self.queue.full():
+            # Drop the oldest waiting message rather than speaking messages minutes late
+            dropped = self.queue.get_nowait()
+            self.queue.task_done()
+            self.logger.warning(
+                f"TTS queue is full; dropped message ID {dropped.id} from {dropped.author}."
+            )
+        self.queue.put_nowait(message)
         self.logger.info(
             f"Message from {message.author} queued for TTS in guild {message.guild.name}."
         )
 
     async def process_queue(self):
         """
-        Continuously processes the TTS queue.
+        Continuously processes the TTS queue, synthesizing audio for the playback queue.
         """
         self.logger.debug("process_queue task started.")
-        while True:
-            try:
+        try:
+            while True:
                 message = await self.queue.get()
-                self.logger.debug(f"Got message from queue: {message.content}")
-                await self.process_tts(message)
-            except asyncio.CancelledError:
-                self.logger.info("process_queue task has been cancelled.")
-                break
-            except Exception as exc:
-                self.logger.error(f"Unexpected error in process_queue: {exc}", exc_info=True)
-            finally:
-                self.queue.task_done()
+                try:
+                    self.logger.debug(f"Got message from queue: {message.content}")
+                    await self.process_tts(message)
+                except asyncio.CancelledError:
+                    # Only stop if this worker itself is being cancelled, not on a stray cancellation
+                    if asyncio.current_task().cancelling():
+                        raise
+                    self.logger.error(
+                        f"TTS processing for message ID {message.id} was cancelled unexpectedly.",
+                        exc_info=True
+                    )
+                except Exception as exc:
+                    self.logger.error(f"Unexpected error in process_queue: {exc}", exc_info=True)
+                finally:
+                    # Only mark items done that were actually taken from the queue
+                    self.queue.task_done()
+        except asyncio.CancelledError:
+            self.logger.info("process_queue task has been cancelled.")
+
+    async def process_playback(self):
+        """
+        Continuously plays synthesized audio from the playback queue, one clip at a time.
+        """
+        self.logger.debug("process_playback task started.")
+        try:
+            while True:
+                message, audio_content, is_last_chunk = await self.playback_queue.get()
+                try:
+                    if audio_content is None:
+                        # End marker for a message that failed part-way; keep the pause before the next one
+                        await asyncio.sleep(self.delay_between_messages)
+                    else:
+                        await self.play_tts(message, audio_content, is_last_chunk)
+                except Exception as exc:
+                    self.logger.error(f"Unexpected error in process_playback: {exc}", exc_info=True)
+                finally:
+                    self.playback_queue.task_done()
+        except asyncio.CancelledError:
+            self.logger.info("process_playback task has been cancelled.")
 
     async def process_tts(self, message):
         """
-        Processes a single message for TTS.
+        Synthesizes a single message and hands the audio to the playback queue.
 
         Args:
             message (disnake.Message): The message to process.
         """
         member = message.author
-        guild = message.guild
 
         self.logger.debug(f"Starting TTS processing for message ID {message.id} from {member}")
 
@@ -136,6 +261,84 @@ class VoiceProcessingCog(commands.Cog):
             voice_id = self.user_voices[member.id]
             self.logger.info(f"Using previously assigned voice '{voice_id}' for user {member}.")
 
+        chunks = self.split_sentences(message.content)
+        if not chunks:
+            self.logger.debug(f"Message ID {message.id} has no text to speak.")
+            return
+
+        # Generate TTS audio while the previous clip is still playing. Chunks are
+        # synthesized concurrently but queued in order, so playback starts with the first.
+        self.logger.debug(f"Generating TTS audio for message ID {message.id} in {len(chunks)} part(s)")
+        tasks = [asyncio.create_task(self.get_tts_audio(chunk, voice_id)) for chunk in chunks]
+        try:
+            for index, task in enumerate(tasks):
+                audio_content = await task
+
+                if not audio_content:
+                    self.logger.error("Failed to generate TTS audio.")
+                    await message.channel.send("❌ Failed to generate TTS audio.")
+                    if index:
+                        # Earlier chunks are already queued without the end-of-message pause
+                        await self.playback_queue.put((message, None, True))
+                    return
+
+                await self.playback_queue.put((message, audio_content, index == len(tasks) - 1))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def split_sentences(self, text: str, max_chars: int = MAX_CHUNK_CHARS) -> list:
+        """
+        Splits text into sentence-aligned chunks so long messages can be synthesized in parts.
+        Consecutive sentences are packed together up to max_chars.
+
+        Args:
+            text (str): The text to split.
+            max_chars (int): The longest chunk to return.
+        """
+        chunks = []
+        current = ""
+        for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+            # A sentence that is too long on its own is split between words
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(' ', 0, max_chars + 1)
+                if cut <= 0:
+                    cut = max_chars
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(sentence[:cut])
+                sentence = sentence[cut:].lstrip()
+
+            if not sentence:
+                continue
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def play_tts(self, message, audio_content, is_last_chunk=True):
+        """
+        Plays synthesized audio in the author's voice channel and waits for it to finish.
+
+        Args:
+            message (disnake.Message): The message the audio was generated for.
+            audio_content (bytes): The synthesized audio.
+            is_last_chunk (bool): Whether this is the message's final chunk.
+        """
+        member = message.author
+        guild = message.guild
+
+        # The member may have left voice while the audio was being generated
+        if not member.voice or not member.voice.channel:
+            self.logger.info(f"User {member} left voice before their TTS message could be played.")
+            return
+
         voice_channel = member.voice.channel
         self.logger.debug(f"User {member} is in voice channel: {voice_channel.name}")
 
@@ -173,124 +376,220 @@ class VoiceProcessingCog(commands.Cog):
                     await message.channel.send(f"❌ Failed to move to your voice channel: {exc}")
                     return
 
-        # Generate TTS audio
-        self.logger.debug(f"Generating TTS audio for message ID {message.id}")
-        audio_content = await self.generate_tts_audio(message.content.strip(), voice_id)
-
-        if audio_content:
-            try:
-                with open(self.audio_path, 'wb') as audio_file:
-                    audio_file.write(audio_content)
-                self.logger.info(f"TTS audio generated and saved to {self.audio_path}")
-            except Exception as exc:
-                self.logger.error(f"Failed to save audio file: {exc}", exc_info=True)
-                await message.channel.send("❌ Failed to save TTS audio.")
-                return
-        else:
-            self.logger.error("Failed to generate TTS audio.")
-            await message.channel.send("❌ Failed to generate TTS audio.")
-            return
-
         # Play the audio in the voice channel
         try:
-            source = disnake.FFmpegPCMAudio(self.audio_path)
-            if not voice_client.is_playing():
-                voice_client.play(
-                    source,
-                    after=lambda e: asyncio.run_coroutine_threadsafe(
-                        self.after_playing(guild.id, e), self.bot.loop
-                    )
-                )
-                self.logger.info(f"Playing audio: {self.audio_path} in voice channel.")
-                await asyncio.sleep(self.delay_between_messages)
-            else:
-                self.logger.warning("Voice client is already playing audio. Re-queuing the message.")
-                await self.queue.put(message)
+            source = self.create_audio_source(audio_content)
+            self.logger.info(f"Playing TTS audio for message ID {message.id} in voice channel.")
+            await self.play_and_wait(voice_client, source, guild.id)
         except Exception as exc:
             self.logger.error(f"Failed to play audio: {exc}", exc_info=True)
             await message.channel.send(f"❌ Failed to play audio: {exc}")
-            await self.delete_audio_file()
+            return
+
+        # Pause between messages, not between the chunks of one message
+        if is_last_chunk:
+            await asyncio.sleep(self.delay_between_messages)
+
+    def create_audio_source(self, audio_content: bytes):
+        """
+        Wraps synthesized audio in a playable source. Ogg Opus clips are played directly;
+        other formats are decoded by FFmpeg reading over stdin.
+
+        Args:
+            audio_content (bytes): The synthesized audio.
+        """
+        # Go by what the provider actually returned, not by what was requested
+        if (
+            audio_content.startswith(b'OggS')
+            and b'OpusHead' in audio_content[:64]
+            and OggOpusAudio.has_20ms_packets(audio_content)
+        ):
+            return OggOpusAudio(audio_content)
+        return disnake.FFmpegPCMAudio(
+            io.BytesIO(audio_content),
+            pipe=True,
+            before_options=FFMPEG_BEFORE_OPTIONS,
+            options=FFMPEG_OPTIONS
+        )
+
+    async def play_and_wait(self, voice_client, source, guild_id: int):
+        """
+        Plays an audio source and returns once it has finished.
+
+        Args:
+            voice_client (disnake.VoiceClient): The connected voice client.
+            source (disnake.AudioSource): The audio to play.
+            guild_id (int): The guild being played in, for logging.
+        """
+        done = asyncio.Event()
+        # The after callback runs on the voice thread; hand straight back to the loop
+        voice_client.play(
+            source,
+            after=lambda e: self.bot.loop.call_soon_threadsafe(self.after_playing, guild_id, e, done)
+        )
+        await done.wait()
 
     async def should_assign_voice(self, member):
-        excluded_role = disnake.utils.get(member.guild.roles, name=self.excluded_role_name)
-        has_excluded_role = excluded_role in member.roles if excluded_role else False
-        return not has_excluded_role
+        guild = member.guild
+        excluded_role = guild.get_role(self.excluded_role_ids.get(guild.id, 0))
+        # Fall back to a name lookup if the role was never resolved, deleted or renamed
+        if excluded_role is None or excluded_role.name != self.excluded_role_name:
+            excluded_role = disnake.utils.get(guild.roles, name=self.excluded_role_name)
+            if excluded_role is None:
+                return True
+            self.excluded_role_ids[guild.id] = excluded_role.id
+        return member.get_role(excluded_role.id) is None
+
+    async def get_session(self):
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers={
+                    "Authorization": f"Bearer {self.tts_api_key}",
+                    "Content-Type": "application/json"
+                },
+                # Keep idle connections to the TTS API open between messages
+                connector=aiohttp.TCPConnector(limit=16, keepalive_timeout=75)
+            )
+        return self.session
+
+    async def get_tts_audio(self, content: str, voice_id: str) -> bytes:
+        """
+        Returns TTS audio for the content, reusing recently synthesized clips.
+
+        Args:
+            content (str): The text to speak.
+            voice_id (str): The voice to speak it with.
+        """
+        key = hashlib.blake2b(f"{voice_id}|{content}".encode(), digest_size=16).hexdigest()
+        audio_content = self.audio_cache.get(key)
+        if audio_content is not None:
+            self.audio_cache.move_to_end(key)
+            self.logger.debug(f"Using cached TTS audio for voice '{voice_id}'.")
+            return audio_content
+
+        # Identical text in the same voice that is already being synthesized waits on that request
+        task = self.inflight_audio.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self.synthesize_and_cache(key, content, voice_id))
+            self.inflight_audio[key] = task
+            task.add_done_callback(lambda t: self.forget_inflight(key, t))
+        else:
+            self.logger.debug(f"Joining in-flight TTS request for voice '{voice_id}'.")
+        self.inflight_waiters[task] = self.inflight_waiters.get(task, 0) + 1
+        try:
+            # Shielded so one caller being cancelled does not cancel the request for the others
+            return await asyncio.shield(task)
+        finally:
+            self.inflight_waiters[task] -= 1
+            if not self.inflight_waiters[task]:
+                del self.inflight_waiters[task]
+                # The last caller gave up, so nobody will play this clip; stop the request.
+                # Forget it first so an identical request arriving meanwhile starts afresh.
+                if not task.done():
+                    self.forget_inflight(key, task)
+                    task.cancel()
+
+    def forget_inflight(self, key: str, task: asyncio.Task):
+        """
+        Removes a synthesis task from the in-flight map unless a newer one has replaced it.
+
+        Args:
+            key (str): The cache key for the clip.
+            task (asyncio.Task): The task to remove.
+        """
+        if self.inflight_audio.get(key) is task:
+            del self.inflight_audio[key]
+
+    async def synthesize_and_cache(self, key: str, content: str, voice_id: str) -> bytes:
+        """
+        Synthesizes a clip under the concurrency limit and stores it in the audio cache.
+
+        Args:
+            key (str): The cache key for the clip.
+            content (str): The text to speak.
+            voice_id (str): The voice to speak it with.
+        """
+        async with self.synthesis_semaphore:
+            audio_content = await self.generate_tts_audio(content, voice_id)
+        if audio_content:
+            self.audio_cache[key] = audio_content
+            if len(self.audio_cache) > self.audio_cache_size:
+                self.audio_cache.popitem(last=False)
+        return audio_content
 
     async def generate_tts_audio(self, content: str, voice_id: str) -> bytes:
         self.logger.debug("Starting TTS audio generation.")
         try:
-            payload = {
-                "voice": voice_id,
-                "input": content,
-                "temperature": self.config['tts'].get('temperature', 0.5),
-                "max_tokens": self.config['tts'].get('max_tokens', 100),
-                "model": self.config['tts'].get('engine', 'standard')
-            }
+            payload = {**self.base_payload, "voice": voice_id, "input": content}
 
             self.logger.debug(f"TTS API payload: {payload}")
 
-            headers = {
-                "Authorization": f"Bearer {self.tts_api_key}",
-                "Content-Type": "application/json"
-            }
-
             self.logger.debug(f"Sending POST request to TTS API at {self.tts_api_url}")
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.tts_api_url, json=payload, headers=headers) as response:
-                    self.logger.debug(f"TTS API responded with status: {response.status}")
-                    if response.status == 200:
-                        audio_content = await response.read()
-                        self.logger.info("TTS audio successfully generated.")
-                        return audio_content
-                    else:
-                        error_text = await response.text()
-                        self.logger.error(
-                            f"TTS API request failed with status {response.status}: {error_text}"
-                        )
-                        return None
+            session = await self.get_session()
+            async with session.post(self.tts_api_url, json=payload) as response:
+                self.logger.debug(f"TTS API responded with status: {response.status}")
+                if response.status == 200:
+                    audio_content = await response.read()
+                    self.logger.info("TTS audio successfully generated.")
+                    return audio_content
+                else:
+                    error_text = await response.text()
+                    self.logger.error(
+                        f"TTS API request failed with status {response.status}: {error_text}"
+                    )
+                    return None
 
         except Exception as e:
             self.logger.error(f"Failed to generate TTS audio: {e}", exc_info=True)
             return None
 
-    async def after_playing(self, guild_id: int, error):
+    def after_playing(self, guild_id: int, error, done: asyncio.Event):
+        """
+        Called on the event loop when a clip finishes; wakes the playback worker.
+
+        Args:
+            guild_id (int): The guild the clip played in.
+            error (Exception): The playback error, if any.
+            done (asyncio.Event): Set once the clip has finished.
+        """
         if error:
             self.logger.error(f"Error in playing audio for guild {guild_id}: {error}", exc_info=True)
         else:
-            self.logger.debug(f"Audio played successfully: {self.audio_path}")
-
-        await self.delete_audio_file()
+            self.logger.debug(f"Audio played successfully in guild {guild_id}.")
 
-    async def delete_audio_file(self):
-        try:
-            if os.path.exists(self.audio_path):
-                os.remove(self.audio_path)
-                self.logger.info(f"Removed temporary audio file: {self.audio_path}")
-            else:
-                self.logger.warning(f"Attempted to delete non-existent audio file: {self.audio_path}")
-        except Exception as exc:
-            self.logger.error(
-                f"Failed to remove temporary audio file: {self.audio_path}. Error: {exc}",
-                exc_info=True
-            )
+        done.set()
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
         guild = member.guild
         guild_id = guild.id
 
-        if guild_id != int(self.config['discord']['guild_id']):
+        if guild_id != self.guild_id:
             self.logger.debug(f"Ignored voice state update from guild ID {guild_id}")
             return
 
+        # Handled before the voice client check so leaves are not missed while the bot is disconnected
+        if before.channel is not None and after.channel is None:
+            if member.id in self.user_voices:
+                del self.user_voices[member.id]
+                self.logger.info(f"Cleared voice assignment for user {member} after leaving voice channel.")
+
         voice_client = self.voice_clients.get(guild_id)
         if not voice_client:
             self.logger.debug(f"No active voice client found for guild ID {guild_id}")
             return
 
         voice_channel = voice_client.channel
-        if len(voice_channel.members) == 1 and voice_channel.members[0].id == self.bot.user.id:
+        # The bot can only end up alone when someone leaves its channel or the bot itself
+        # is moved (e.g. dragged into an empty channel or reconnected)
+        left_bot_channel = (
+            before.channel is not None
+            and before.channel.id == voice_channel.id
+            and (after.channel is None or after.channel.id != voice_channel.id)
+        )
+        bot_moved = member.id == self.bot.user.id and after.channel is not None
+        if (left_bot_channel or bot_moved) and len(voice_channel.members) == 1 and voice_channel.members[0].id == self.bot.user.id:
             try:
                 await voice_client.disconnect()
                 self.logger.info(
@@ -302,11 +601,6 @@ class VoiceProcessingCog(commands.Cog):
                     f"Failed to disconnect from voice channel: {exc}", exc_info=True
                 )
 
-        if before.channel is not None and after.channel is None:
-            if member.id in self.user_voices:
-                del self.user_voices[member.id]
-                self.logger.info(f"Cleared voice assignment for user {member} after leaving voice channel.")
-
     @commands.slash_command(name="leave", description="Make the bot leave the voice channel.")
     async def leave(self, inter: disnake.ApplicationCommandInteraction):
         voice_client = inter.guild.voice_client
@@ -346,18 +640,14 @@ class VoiceProcessingCog(commands.Cog):
                         f"Failed to disconnect from voice channel in guild ID {guild_id}: {exc}",
                         exc_info=True
                     )
-        if hasattr(self, 'process_queue_task') and self.process_queue_task and not self.process_queue_task.done():
+        if self.process_queue_task and not self.process_queue_task.done():
             self.process_queue_task.cancel()
             self.logger.debug("Cancelled process_queue task during cog unload.")
-        if os.path.exists(self.audio_path):
-            try:
-                os.remove(self.audio_path)
-                self.logger.info(f"Removed fixed audio file: {self.audio_path}")
-            except Exception as exc:
-                self.logger.error(
-                    f"Failed to remove fixed audio file: {self.audio_path}. Error: {exc}",
-                    exc_info=True
-                )
+        if self.process_playback_task and not self.process_playback_task.done():
+            self.process_playback_task.cancel()
+            self.logger.debug("Cancelled process_playback task during cog unload.")
+        if self.session and not self.session.closed:
+            asyncio.create_task(self.session.close())
 
 def setup(bot):
     bot.add_cog(VoiceProcessingCog(bot))
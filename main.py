@@ -5,7 +5,9 @@ import json
 import sys
 import signal
 import asyncio
-from logging.handlers import RotatingFileHandler
+import atexit
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Any, Dict
 
 # Constants
@@ -84,7 +86,6 @@ def setup_logger(config: Dict[str, Any]) -> logging.Logger:
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
 
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
@@ -94,7 +95,13 @@ def setup_logger(config: Dict[str, Any]) -> logging.Logger:
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
         console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
+
+        # Write to file and console from a background thread so logging never blocks the event loop
+        log_queue = queue.Queue(-1)
+        listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)  # Flushes queued records on exit
+        logger.addHandler(QueueHandler(log_queue))
 
     return logger
 